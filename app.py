@@ -5,19 +5,62 @@ Real-time military logistics optimization dashboard.
 """
 
 from flask import Flask, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.data_loader import load_all_data
 from src.optimizer import ConvoyOptimizer
 
-app = Flask(__name__, 
+class NumpyJSONProvider(DefaultJSONProvider):
+    """JSON provider that understands NumPy scalars (e.g. float32)."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, np.generic):
+            return o.item()
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(NumpyJSONProvider):
+    """JSON provider backed by orjson's native (C) encoder.
+
+    orjson serializes NumPy scalars and arrays directly via
+    OPT_SERIALIZE_NUMPY, so the large convoy/route payloads skip the
+    stdlib's per-object dict walking entirely.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app = Flask(__name__,
     template_folder='templates',
     static_folder='static'
 )
+app.json = OrjsonProvider(app) if orjson is not None else NumpyJSONProvider(app)
 
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0 
@@ -34,17 +77,86 @@ optimizer = ConvoyOptimizer(
     routes=routes
 )
 
+# Column selections/renames for the list endpoints, computed once at import.
+# The data loader guarantees all of these columns exist after cleaning.
+SP_COLS = {
+    'id': 'id',
+    'name': 'name',
+    'lat': 'lat',
+    'lon': 'lon',
+    'region': 'region',
+    'country': 'country',
+    'base_type': 'base_type',
+    'troops': 'troops',
+    'food_tons': 'food_tons',
+    'ammo_tons': 'ammo_tons',
+    'fuel_tons': 'fuel_tons',
+    'medical_tons': 'medical_tons',
+    'total_inventory_tons': 'total_inventory',
+    'has_airstrip': 'has_airstrip',
+}
 
-def get_coords_dict():
-    """Build coordinate lookup dictionary."""
-    coords = {}
-    for _, sp in supply_points.iterrows():
-        coords[sp['id']] = {'lat': sp['lat'], 'lon': sp['lon'], 'name': sp['name']}
-    for _, dest in destinations.iterrows():
-        coords[dest['dest_id']] = {'lat': dest['lat'], 'lon': dest['lon'], 'name': dest['dest_name']}
+DEST_COLS = {
+    'dest_id': 'id',
+    'dest_name': 'name',
+    'lat': 'lat',
+    'lon': 'lon',
+    'region': 'region',
+    'country': 'country',
+    'priority': 'priority',
+    'food_tons': 'food_tons',
+    'ammo_tons': 'ammo_tons',
+    'fuel_tons': 'fuel_tons',
+    'medical_tons': 'medical_tons',
+    'total_demand_tons': 'total_demand',
+    'has_airstrip': 'has_airstrip',
+}
+
+VEHICLE_COLS = {
+    'vehicle_id': 'id',
+    'type': 'type',
+    'mode': 'mode',
+    'capacity_tons': 'capacity',
+    'max_range_km': 'max_range',
+    'speed_kmh': 'speed_kmh',
+    'home_base': 'home_base',
+}
+
+
+def _build_coords_dict():
+    """Build coordinate lookup dictionary (point id -> lat/lon/name)."""
+    coords = dict(zip(
+        supply_points['id'],
+        supply_points[['lat', 'lon', 'name']].to_dict(orient='records')
+    ))
+    dest_records = destinations[['lat', 'lon', 'dest_name']].rename(
+        columns={'dest_name': 'name'}
+    ).to_dict(orient='records')
+    coords.update(zip(destinations['dest_id'], dest_records))
     return coords
 
 
+# Supply points and destinations are loaded once at startup, so the lookup
+# can be built once instead of rebuilt on every request.
+COORDS = _build_coords_dict()
+
+# Flat coordinate table for merge-based joins against the routes dataframe.
+COORDS_DF = pd.DataFrame(
+    [(pid, c['lat'], c['lon']) for pid, c in COORDS.items()],
+    columns=['id', 'lat', 'lon']
+)
+
+# Vehicle index by home base, so /api/optimize does a keyed lookup instead
+# of scanning the fleet on every request.
+HOME_BASE_TO_VEHICLES = vehicles.groupby('home_base')['vehicle_id'].apply(list).to_dict()
+ALL_VEHICLE_IDS = vehicles['vehicle_id'].tolist()
+
+
+def get_coords_dict():
+    """Return the precomputed coordinate lookup dictionary."""
+    return COORDS
+
+
 @app.route('/')
 def index():
     """Main dashboard page."""
@@ -54,87 +166,39 @@ def index():
 @app.route('/api/supply-points')
 def get_supply_points():
     """Get all supply points."""
-    data = []
-    for _, sp in supply_points.iterrows():
-        data.append({
-            'id': sp['id'],
-            'name': sp['name'],
-            'lat': sp['lat'],
-            'lon': sp['lon'],
-            'region': sp.get('region', 'UNKNOWN'),
-            'country': sp.get('country', 'UNKNOWN'),
-            'base_type': sp.get('base_type', 'UNKNOWN'),
-            'troops': int(sp.get('troops', 0)),
-            'food_tons': sp.get('food_tons', 0),
-            'ammo_tons': sp.get('ammo_tons', 0),
-            'fuel_tons': sp.get('fuel_tons', 0),
-            'medical_tons': sp.get('medical_tons', 0),
-            'total_inventory': sp.get('total_inventory_tons', 0),
-            'has_airstrip': bool(sp.get('has_airstrip', False))
-        })
-    return jsonify(data)
+    df = supply_points[list(SP_COLS)].rename(columns=SP_COLS)
+    return jsonify(df.to_dict(orient='records'))
 
 
 @app.route('/api/destinations')
 def get_destinations():
     """Get all destinations."""
-    data = []
-    for _, dest in destinations.iterrows():
-        data.append({
-            'id': dest['dest_id'],
-            'name': dest['dest_name'],
-            'lat': dest['lat'],
-            'lon': dest['lon'],
-            'region': dest.get('region', 'UNKNOWN'),
-            'country': dest.get('country', 'UNKNOWN'),
-            'priority': dest['priority'],
-            'food_tons': dest.get('food_tons', 0),
-            'ammo_tons': dest.get('ammo_tons', 0),
-            'fuel_tons': dest.get('fuel_tons', 0),
-            'medical_tons': dest.get('medical_tons', 0),
-            'total_demand': dest.get('total_demand_tons', 0),
-            'has_airstrip': bool(dest.get('has_airstrip', False))
-        })
-    return jsonify(data)
+    df = destinations[list(DEST_COLS)].rename(columns=DEST_COLS)
+    return jsonify(df.to_dict(orient='records'))
 
 
 @app.route('/api/vehicles')
 def get_vehicles():
     """Get all vehicles."""
-    data = []
-    for _, v in vehicles.iterrows():
-        data.append({
-            'id': v['vehicle_id'],
-            'type': v['type'],
-            'mode': v.get('mode', 'GROUND'),
-            'capacity': v['capacity_tons'],
-            'max_range': v['max_range_km'],
-            'speed_kmh': v.get('speed_kmh', 80),
-            'home_base': v['home_base']
-        })
-    return jsonify(data)
+    df = vehicles[list(VEHICLE_COLS)].rename(columns=VEHICLE_COLS)
+    return jsonify(df.to_dict(orient='records'))
 
 
 @app.route('/api/routes')
 def get_routes():
     """Get all route segments."""
-    coords = get_coords_dict()
-    data = []
-    for _, r in routes.iterrows():
-        from_id = r['from_point']
-        to_id = r['to_point']
-        
-        if from_id in coords and to_id in coords:
-            data.append({
-                'from_id': from_id,
-                'to_id': to_id,
-                'from_coords': [coords[from_id]['lat'], coords[from_id]['lon']],
-                'to_coords': [coords[to_id]['lat'], coords[to_id]['lon']],
-                'distance_km': r['distance_km'],
-                'threat_level': r['threat_level'],
-                'road_condition': r['road_condition']
-            })
-    return jsonify(data)
+    # Hash-join the coordinate table onto both endpoints; segments whose
+    # endpoints are unknown simply drop out of the inner merges.
+    r = routes.merge(
+        COORDS_DF.add_prefix('from_'), left_on='from_point', right_on='from_id'
+    ).merge(
+        COORDS_DF.add_prefix('to_'), left_on='to_point', right_on='to_id'
+    )
+    r['from_coords'] = list(zip(r['from_lat'], r['from_lon']))
+    r['to_coords'] = list(zip(r['to_lat'], r['to_lon']))
+    cols = ['from_id', 'to_id', 'from_coords', 'to_coords',
+            'distance_km', 'threat_level', 'road_condition']
+    return jsonify(r[cols].to_dict(orient='records'))
 
 
 @app.route('/api/optimize', methods=['POST'])
@@ -146,17 +210,13 @@ def optimize():
     avoid_high_threat = data.get('avoid_high_threat', True)
     selected_vehicles = data.get('vehicles', None)
     
-    # Get available vehicles
-    if selected_vehicles:
-        available_vehicles = selected_vehicles
-    else:
-        available_vehicles = vehicles[
-            vehicles['home_base'] == supply_point_id
-        ]['vehicle_id'].tolist()
-        
-        # If no vehicles at this base, use all available
-        if not available_vehicles:
-            available_vehicles = vehicles['vehicle_id'].tolist()
+    # Get available vehicles: explicit selection, else the ones stationed
+    # at this base, else the whole fleet
+    available_vehicles = (
+        selected_vehicles
+        or HOME_BASE_TO_VEHICLES.get(supply_point_id)
+        or ALL_VEHICLE_IDS
+    )
     
     # Run optimization
     assignments = optimizer.optimize_routes(
@@ -165,37 +225,45 @@ def optimize():
         avoid_high_threat=avoid_high_threat
     )
     
-    # Get coordinates for building routes
-    coords = get_coords_dict()
-    
-    # Format response
+    # Calculate ETAs (in minutes) for all assignments in one vectorized pass
+    dist = np.fromiter(
+        (a.total_distance_km for a in assignments), dtype=float, count=len(assignments)
+    )
+    speeds = np.fromiter(
+        (getattr(a, 'speed_kmh', 80) for a in assignments), dtype=float, count=len(assignments)
+    )
+    eta_mins = (dist / speeds * 60).astype(int)
+
+    # Format response, accumulating summary stats in the same pass
+    coords_get = COORDS.get  # local alias avoids a global lookup per id
     convoy_data = []
+    total_distance = 0.0
+    total_cargo = 0.0
+    served_destinations = set()
     for i, a in enumerate(assignments):
-        # Build coordinate path
-        route_coords = []
-        for loc_id in a.route_sequence:
-            if loc_id in coords:
-                route_coords.append([coords[loc_id]['lat'], coords[loc_id]['lon']])
-        
-        # Calculate ETA using actual vehicle speed
-        speed = getattr(a, 'speed_kmh', 80)
-        eta_hours = a.total_distance_km / speed
-        if eta_hours < 1:
-            eta_str = f"{int(eta_hours * 60)} min"
-        else:
-            h = int(eta_hours)
-            m = int((eta_hours - h) * 60)
-            eta_str = f"{h}h {m}m"
-        
+        total_distance += a.total_distance_km
+        total_cargo += a.total_demand_tons
+        served_destinations.update(a.destinations)
+
+        # Build coordinate path, skipping ids with no known coordinates
+        route_coords = [
+            [c['lat'], c['lon']]
+            for c in map(coords_get, a.route_sequence)
+            if c is not None
+        ]
+
+        mins = eta_mins[i]
+        eta_str = f"{mins // 60}h {mins % 60}m" if mins >= 60 else f"{mins} min"
+
         # Determine transport mode
         mode = getattr(a, 'vehicle_mode', 'GROUND')
-        
+
         convoy_data.append({
             'id': i + 1,
             'vehicle_id': a.vehicle_id,
             'vehicle_type': a.vehicle_type,
             'mode': mode,
-            'speed_kmh': speed,
+            'speed_kmh': speeds[i],
             'supply_point': a.supply_point,
             'destinations': a.destinations,
             'route_sequence': a.route_sequence,
@@ -206,13 +274,6 @@ def optimize():
             'eta': eta_str
         })
     
-    # Calculate summary stats
-    total_distance = sum(a.total_distance_km for a in assignments)
-    total_cargo = sum(a.total_demand_tons for a in assignments)
-    served_destinations = set()
-    for a in assignments:
-        served_destinations.update(a.destinations)
-    
     return jsonify({
         'success': True,
         'convoys': convoy_data,
@@ -226,37 +287,86 @@ def optimize():
     })
 
 
+# Shared HTTP session for OSRM lookups so TCP connections are reused
+# across requests instead of paying connection setup per segment.
+OSRM_BASE_URL = 'http://router.project-osrm.org/route/v1/driving'
+osrm_session = requests.Session()
+osrm_session.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+osrm_pool = ThreadPoolExecutor(max_workers=16)
+
+
+@lru_cache(maxsize=8192)
+def _osrm_path(start_lat, start_lon, end_lat, end_lon):
+    """Query OSRM for a driving path, memoized on the exact coordinates.
+
+    Road routes between fixed points are deterministic, so repeat lookups
+    are served from the cache without touching the network. Returns a
+    tuple of (lat, lon) tuples, or None if OSRM found no route. Network
+    errors propagate so failures are never cached.
+    """
+    url = f"{OSRM_BASE_URL}/{start_lon},{start_lat};{end_lon},{end_lat}"
+    params = {'overview': 'full', 'geometries': 'geojson'}
+    response = osrm_session.get(url, params=params, timeout=5)
+
+    if response.status_code == 200:
+        data = response.json()
+        if data['code'] == 'Ok' and data['routes']:
+            coords = data['routes'][0]['geometry']['coordinates']
+            # Convert from [lon, lat] to [lat, lon]
+            return tuple((c[1], c[0]) for c in coords)
+    return None
+
+
+def _fetch_road_path(start_lat, start_lon, end_lat, end_lon):
+    """Fetch a driving path from OSRM, falling back to a straight line."""
+    # Quantize to ~1 m so near-duplicate coordinates share a cache entry.
+    key = (round(start_lat, 5), round(start_lon, 5),
+           round(end_lat, 5), round(end_lon, 5))
+    try:
+        path = _osrm_path(*key)
+        if path is not None:
+            return [list(point) for point in path]
+    except Exception as e:
+        # Log the error for debugging - OSRM service may be unavailable
+        app.logger.warning(f"OSRM routing failed: {e}")
+
+    # Fallback to straight line
+    return [[start_lat, start_lon], [end_lat, end_lon]]
+
+
 @app.route('/api/road-route')
 def get_road_route():
     """Get actual road route between two points using OSRM."""
-    import requests
-    
     start_lat = request.args.get('start_lat', type=float)
     start_lon = request.args.get('start_lon', type=float)
     end_lat = request.args.get('end_lat', type=float)
     end_lon = request.args.get('end_lon', type=float)
-    
+
     if not all([start_lat, start_lon, end_lat, end_lon]):
         return jsonify({'error': 'Missing coordinates'}), 400
-    
-    try:
-        url = f"http://router.project-osrm.org/route/v1/driving/{start_lon},{start_lat};{end_lon},{end_lat}"
-        params = {'overview': 'full', 'geometries': 'geojson'}
-        response = requests.get(url, params=params, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data['code'] == 'Ok' and data['routes']:
-                coords = data['routes'][0]['geometry']['coordinates']
-                # Convert from [lon, lat] to [lat, lon]
-                path = [[c[1], c[0]] for c in coords]
-                return jsonify({'path': path})
-    except Exception as e:
-        # Log the error for debugging - OSRM service may be unavailable
-        app.logger.warning(f"OSRM routing failed: {e}")
-    
-    # Fallback to straight line
-    return jsonify({'path': [[start_lat, start_lon], [end_lat, end_lon]]})
+
+    return jsonify({'path': _fetch_road_path(start_lat, start_lon, end_lat, end_lon)})
+
+
+@app.route('/api/road-routes', methods=['POST'])
+def get_road_routes():
+    """Get road routes for multiple segments concurrently.
+
+    Expects {'pairs': [[start_lat, start_lon, end_lat, end_lon], ...]} and
+    returns {'paths': [...]} in the same order. Fetching the segments in
+    parallel makes the total latency roughly one round trip instead of one
+    per segment.
+    """
+    data = request.get_json()
+    pairs = data.get('pairs') if data else None
+
+    if not isinstance(pairs, list) or not all(
+        isinstance(p, (list, tuple)) and len(p) == 4 for p in pairs
+    ):
+        return jsonify({'error': 'Expected pairs of [start_lat, start_lon, end_lat, end_lon]'}), 400
+
+    paths = list(osrm_pool.map(lambda p: _fetch_road_path(*p), pairs))
+    return jsonify({'paths': paths})
 
 
 if __name__ == '__main__':
@@ -267,4 +377,5 @@ if __name__ == '__main__':
     print(f"Open http://localhost:5000 in your browser")
     print("="*60 + "\n")
     
-    app.run(debug=True, host='127.0.0.1', port=5000)
+    # Dev server only; for production use: gunicorn app:app -c gunicorn.conf.py
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', host='127.0.0.1', port=5000)
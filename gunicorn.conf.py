@@ -0,0 +1,17 @@
+"""Gunicorn configuration for the convoy route optimizer.
+
+Run with: gunicorn app:app -c gunicorn.conf.py
+
+Threaded workers let I/O-bound OSRM lookups overlap with CPU-bound
+optimization runs instead of serializing behind the single-threaded
+Flask dev server. preload_app loads and cleans the data once in the
+master so worker forks share the dataframes copy-on-write.
+"""
+
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', 4))
+threads = 8
+worker_class = 'gthread'
+preload_app = True
@@ -3,21 +3,77 @@ Data Loader Module
 Handles ingestion and cleaning of messy logistics data.
 """
 
+import numpy as np
 import pandas as pd
 import os
-from typing import Tuple
+from typing import Optional, Tuple
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 
 # Supply categories
 SUPPLY_CATEGORIES = ['food', 'ammo', 'fuel', 'medical']
+TONS_COLUMNS = [f'{cat}_tons' for cat in SUPPLY_CATEGORIES]
+
+
+def _read_csv(filepath: str, comment: Optional[str] = None) -> pd.DataFrame:
+    """Read a CSV with pandas' multithreaded pyarrow engine when possible.
+
+    The pyarrow engine does not support comment stripping, so files that
+    need it (and installs without pyarrow) fall back to the C engine.
+    """
+    if HAS_PYARROW and comment is None:
+        return pd.read_csv(filepath, engine='pyarrow')
+    return pd.read_csv(filepath, comment=comment)
+
+
+def _use_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Back string columns with Arrow so .str chains run on C++ kernels.
+
+    The .str.lower().str.strip() normalization passes then dispatch to
+    Arrow's vectorized UTF-8 kernels instead of per-row Python strings.
+    No-op when pyarrow is unavailable.
+    """
+    if HAS_PYARROW:
+        str_cols = [col for col in df.columns if pd.api.types.is_string_dtype(df[col])]
+        if str_cols:
+            df[str_cols] = df[str_cols].astype('string[pyarrow]')
+    return df
+
+
+def _yes_no_to_bool(df: pd.DataFrame, col: str) -> pd.DataFrame:
+    """Coerce a yes/no column to plain bool, defaulting missing to False."""
+    if col in df.columns:
+        df[col] = df[col].str.strip().str.lower().eq('yes').fillna(False).astype(bool)
+    else:
+        df[col] = False
+    return df
+
+
+def _fill_tons_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Ensure all categorized tonnage columns exist and have no NaNs.
+
+    Missing columns are added as zero and NaNs are filled in a single
+    pass instead of one fillna per category.
+    """
+    missing = [col for col in TONS_COLUMNS if col not in df.columns]
+    if missing:
+        df[missing] = 0
+    df[TONS_COLUMNS] = df[TONS_COLUMNS].fillna(0)
+    return df
 
 
 def load_and_clean_supply_points(filepath: str) -> pd.DataFrame:
     """
     Load and clean supply points data with categorized inventory.
     """
-    df = pd.read_csv(filepath, comment='#')
-    
+    df = _read_csv(filepath, comment='#')
+    df = _use_arrow_strings(df)
+
     # Normalize column names
     df.columns = df.columns.str.lower().str.strip()
     
@@ -31,15 +87,16 @@ def load_and_clean_supply_points(filepath: str) -> pd.DataFrame:
     df['name'] = df['name'].fillna(df['id'])
     
     # Handle categorized inventory columns
-    for cat in SUPPLY_CATEGORIES:
-        col = f'{cat}_tons'
-        if col in df.columns:
-            df[col] = df[col].fillna(0)
-        else:
-            df[col] = 0
-    
-    # Calculate total inventory (row-wise sum across supply categories)
-    df['total_inventory_tons'] = df[[f'{cat}_tons' for cat in SUPPLY_CATEGORIES]].sum(axis=1)
+    df = _fill_tons_columns(df)
+
+    # Calculate total inventory (row-wise SIMD sum over one contiguous block)
+    tons = df[TONS_COLUMNS].to_numpy(dtype=np.float32)
+    df['total_inventory_tons'] = tons.sum(axis=1)
+
+    # Coordinates and tonnages fit comfortably in float32; halving the
+    # element width halves the memory traffic of downstream arithmetic
+    float_cols = ['lat', 'lon'] + TONS_COLUMNS + ['total_inventory_tons']
+    df[float_cols] = df[float_cols].astype('float32')
     
     # Handle optional columns
     if 'region' not in df.columns:
@@ -52,10 +109,7 @@ def load_and_clean_supply_points(filepath: str) -> pd.DataFrame:
         df['troops'] = 0
 
     # Handle has_airstrip column (convert yes/no to boolean)
-    if 'has_airstrip' in df.columns:
-        df['has_airstrip'] = df['has_airstrip'].str.lower().str.strip() == 'yes'
-    else:
-        df['has_airstrip'] = False
+    df = _yes_no_to_bool(df, 'has_airstrip')
     
     # Filter to active supply points only
     df = df[df['status'] == 'active'].copy()
@@ -69,8 +123,9 @@ def load_and_clean_destinations(filepath: str) -> pd.DataFrame:
     """
     Load and clean destination data with categorized demand.
     """
-    df = pd.read_csv(filepath, comment='#')
-    
+    df = _read_csv(filepath, comment='#')
+    df = _use_arrow_strings(df)
+
     # Normalize column names
     df.columns = df.columns.str.lower().str.strip()
     
@@ -81,24 +136,29 @@ def load_and_clean_destinations(filepath: str) -> pd.DataFrame:
     # Normalize priority levels
     df['priority'] = df['priority'].fillna('medium')
     df['priority'] = df['priority'].str.lower().str.strip()
-    
+
+    # Few distinct values over many rows: store as categorical so later
+    # maps and comparisons work on integer codes instead of strings
+    df['priority'] = df['priority'].astype('category')
+
     # Map priority to numeric scores
     priority_map = {'high': 3, 'medium': 2, 'low': 1}
-    df['priority_score'] = df['priority'].map(priority_map).fillna(2)
+    df['priority_score'] = df['priority'].map(priority_map).astype('float64').fillna(2)
     
     # Clean destination names
     df['dest_name'] = df['dest_name'].str.title()
     
     # Handle categorized demand columns
-    for cat in SUPPLY_CATEGORIES:
-        col = f'{cat}_tons'
-        if col in df.columns:
-            df[col] = df[col].fillna(0)
-        else:
-            df[col] = 0
-    
-    # Calculate total demand (row-wise sum across supply categories)
-    df['total_demand_tons'] = df[[f'{cat}_tons' for cat in SUPPLY_CATEGORIES]].sum(axis=1)
+    df = _fill_tons_columns(df)
+
+    # Calculate total demand (row-wise SIMD sum over one contiguous block)
+    tons = df[TONS_COLUMNS].to_numpy(dtype=np.float32)
+    df['total_demand_tons'] = tons.sum(axis=1)
+
+    # Coordinates and tonnages fit comfortably in float32; halving the
+    # element width halves the memory traffic of downstream arithmetic
+    float_cols = ['lat', 'lon'] + TONS_COLUMNS + ['total_demand_tons']
+    df[float_cols] = df[float_cols].astype('float32')
     
     # Handle optional columns
     if 'region' not in df.columns:
@@ -107,10 +167,7 @@ def load_and_clean_destinations(filepath: str) -> pd.DataFrame:
         df['country'] = 'UNKNOWN'
 
     # Handle has_airstrip column (convert yes/no to boolean)
-    if 'has_airstrip' in df.columns:
-        df['has_airstrip'] = df['has_airstrip'].str.lower().str.strip() == 'yes'
-    else:
-        df['has_airstrip'] = False
+    df = _yes_no_to_bool(df, 'has_airstrip')
 
     print(f"Loaded {len(df)} destinations")
     return df
@@ -120,8 +177,9 @@ def load_and_clean_vehicles(filepath: str) -> pd.DataFrame:
     """
     Load and clean vehicle fleet data.
     """
-    df = pd.read_csv(filepath)
-    
+    df = _read_csv(filepath)
+    df = _use_arrow_strings(df)
+
     # Normalize column names
     df.columns = df.columns.str.lower().str.strip()
     
@@ -134,20 +192,17 @@ def load_and_clean_vehicles(filepath: str) -> pd.DataFrame:
         df['mode'] = df['mode'].str.upper().str.strip()
     else:
         df['mode'] = 'GROUND'  # Default to ground
-    
-    # Fill missing speed with mode-based defaults
+    df['mode'] = df['mode'].astype('category')
+
+    # Fill missing speed with mode-based defaults in one pass
     if 'speed_kmh' not in df.columns:
         df['speed_kmh'] = 80  # Default speed
     speed_defaults = {'GROUND': 80, 'AIR': 300, 'WATER': 40}
-    for mode, default_speed in speed_defaults.items():
-        mask = (df['mode'] == mode) & (df['speed_kmh'].isna())
-        df.loc[mask, 'speed_kmh'] = default_speed
-    
-    # Fill missing range with mode-based defaults
+    df['speed_kmh'] = df['speed_kmh'].fillna(df['mode'].map(speed_defaults))
+
+    # Fill missing range with mode-based defaults in one pass
     range_defaults = {'GROUND': 500, 'AIR': 800, 'WATER': 400}
-    for mode, default_range in range_defaults.items():
-        mask = (df['mode'] == mode) & (df['max_range_km'].isna())
-        df.loc[mask, 'max_range_km'] = default_range
+    df['max_range_km'] = df['max_range_km'].fillna(df['mode'].map(range_defaults))
     
     # Filter to available vehicles only
     df = df[df['status'] == 'available'].copy()
@@ -161,39 +216,72 @@ def load_and_clean_routes(filepath: str) -> pd.DataFrame:
     """
     Load and clean route/road network data.
     """
-    df = pd.read_csv(filepath)
-    
+    df = _read_csv(filepath)
+    df = _use_arrow_strings(df)
+
     # Normalize column names
     df.columns = df.columns.str.lower().str.strip()
     
     # Normalize threat levels
     df['threat_level'] = df['threat_level'].fillna('medium')
     df['threat_level'] = df['threat_level'].str.lower().str.strip()
-    
+
+    # Few distinct values over many rows: store as categorical so later
+    # maps and comparisons work on integer codes instead of strings
+    df['threat_level'] = df['threat_level'].astype('category')
+
     # Map threat to numeric cost multiplier
     threat_cost = {'low': 1.0, 'medium': 1.5, 'high': 2.5}
-    df['threat_multiplier'] = df['threat_level'].map(threat_cost).fillna(1.5)
-    
+    df['threat_multiplier'] = df['threat_level'].map(threat_cost).astype('float64').fillna(1.5)
+
     # Fill missing road conditions
     df['road_condition'] = df['road_condition'].fillna('unknown')
     df['road_condition'] = df['road_condition'].str.lower()
-    
+    df['road_condition'] = df['road_condition'].astype('category')
+
+
     # Calculate effective distance
     df['effective_distance'] = df['distance_km'] * df['threat_multiplier']
+
+    float_cols = ['distance_km', 'threat_multiplier', 'effective_distance']
+    df[float_cols] = df[float_cols].astype('float32')
     
     print(f"Loaded {len(df)} route segments")
     return df
 
 
+def _load_cached(loader, filepath: str) -> pd.DataFrame:
+    """Load a CSV through a Parquet cache keyed on the source file's mtime.
+
+    The cleaned dataframe is persisted next to the source CSV; as long as
+    the CSV is unchanged, subsequent startups read the columnar cache and
+    skip parsing and string normalization entirely. Falls back to the
+    loader when pyarrow is unavailable or the cache cannot be written.
+    """
+    if not HAS_PYARROW:
+        return loader(filepath)
+
+    cache_path = filepath + '.parquet'
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(filepath):
+        return pd.read_parquet(cache_path)
+
+    df = loader(filepath)
+    try:
+        df.to_parquet(cache_path, compression='zstd')
+    except OSError as e:
+        print(f"Could not write cache {cache_path}: {e}")
+    return df
+
+
 def load_all_data(data_dir: str = 'data') -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Load and clean all data files from the data directory.
     """
-    supply_points = load_and_clean_supply_points(os.path.join(data_dir, 'supply_points.csv'))
-    destinations = load_and_clean_destinations(os.path.join(data_dir, 'destinations.csv'))
-    vehicles = load_and_clean_vehicles(os.path.join(data_dir, 'vehicles.csv'))
-    routes = load_and_clean_routes(os.path.join(data_dir, 'routes.csv'))
-    
+    supply_points = _load_cached(load_and_clean_supply_points, os.path.join(data_dir, 'supply_points.csv'))
+    destinations = _load_cached(load_and_clean_destinations, os.path.join(data_dir, 'destinations.csv'))
+    vehicles = _load_cached(load_and_clean_vehicles, os.path.join(data_dir, 'vehicles.csv'))
+    routes = _load_cached(load_and_clean_routes, os.path.join(data_dir, 'routes.csv'))
+
     return supply_points, destinations, vehicles, routes
 
 
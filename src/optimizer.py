@@ -3,23 +3,83 @@ Optimizer Module
 Implements vehicle routing optimization with constraints.
 """
 
+import hashlib
+import heapq
+import math
+import os
+import pickle
+from collections import Counter, namedtuple
+
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Tuple, Optional, Set
 from dataclasses import dataclass
 
+try:
+    from scipy.sparse.csgraph import floyd_warshall
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+# Threat levels as small ints, so hot-path comparisons are integer max()
+# instead of dict lookups; index THREAT_NAME with a rank to go back
+THREAT_RANK = {'low': 1, 'medium': 2, 'high': 3}
+THREAT_NAME = ('none', 'low', 'medium', 'high')
+
+# Just the vehicle fields the greedy loop reads, as a namedtuple so field
+# access is a slot read instead of a dict (or pandas) lookup per use
+_VehicleRec = namedtuple(
+    '_VehicleRec',
+    ['vehicle_id', 'type', 'mode', 'capacity_tons', 'max_range_km', 'speed_kmh']
+)
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two lat/lon points in km."""
+    R = 6371  # Earth's radius in km
+
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = math.sin(delta_lat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon/2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+
+    return R * c
 
-@dataclass
+
+if HAS_NUMBA:
+    # Module-level scalar kernel (no self capture) so Numba can compile it.
+    # No cache=True: the on-disk cache keys on the import name, and this
+    # module is imported both as `optimizer` (CLI) and `src.optimizer`.
+    _haversine_km = njit(fastmath=True)(_haversine_km)
+
+
+@dataclass(slots=True)
 class ConvoyAssignment:
-    """Represents a single convoy mission assignment."""
+    """Represents a single convoy mission assignment.
+
+    Slotted, with the sequences stored as tuples: no per-instance
+    __dict__ and immutable payloads, which matters when an optimization
+    run fans out into many assignments.
+    """
     vehicle_id: str
     vehicle_type: str
     vehicle_mode: str
     supply_point: str
-    destinations: List[str]
+    destinations: Tuple[str, ...]
     total_distance_km: float
     total_demand_tons: float
     threat_exposure: str
-    route_sequence: List[str]
+    route_sequence: Tuple[str, ...]
     speed_kmh: float = 80.0
 
 
@@ -40,161 +100,417 @@ class ConvoyOptimizer:
         destinations: pd.DataFrame,
         vehicles: pd.DataFrame,
         routes: pd.DataFrame,
-        max_threat_level: str = 'high'
+        max_threat_level: str = 'high',
+        cache_dir: Optional[str] = None
     ):
         self.supply_points = supply_points
         self.destinations = destinations
         self.vehicles = vehicles
         self.routes = routes
         self.max_threat_level = max_threat_level
-        
-        # Build graph representation
-        self.graph = self._build_graph()
-        
+        self.cache_dir = cache_dir
+
+        # Build graph representation and all-pairs shortest paths, via
+        # the on-disk cache when one is configured so repeat
+        # instantiations over the same road network skip the precompute
+        if not self._load_graph_cache():
+            self._build_graph()
+
+            # Precompute all-pairs shortest paths so path queries in the
+            # greedy loop are table lookups instead of per-query traversals
+            self._dist_any = None
+            if HAS_SCIPY:
+                self._build_distance_matrices()
+
+            self._save_graph_cache()
+
         # Threat levels mapping
-        self.threat_threshold = {'low': 1, 'medium': 2, 'high': 3}
+        self.threat_threshold = THREAT_RANK
+
+        # Path-query memo: the greedy loop asks for the same (from, to,
+        # avoid) pairs once per candidate destination and per vehicle
+        self._path_cache: Dict[Tuple[str, str, bool], Tuple[float, Tuple[str, ...], str]] = {}
+
+        # Destination coordinate arrays (radians) for the vectorized
+        # reachability filter in optimize_routes
+        self._dest_ids = self.destinations['dest_id'].to_numpy()
+        self._dest_lat_rad = np.radians(self.destinations['lat'].to_numpy(dtype=np.float64))
+        self._dest_lon_rad = np.radians(self.destinations['lon'].to_numpy(dtype=np.float64))
+        self._dest_priority = self.destinations['priority_score'].to_numpy(dtype=np.float64)
+
+        # O(1) row lookups by id, replacing the boolean-mask scans the
+        # greedy loop used to run once per candidate destination
+        self._sp_by_id = {
+            rec['id']: rec for rec in self.supply_points.to_dict(orient='records')
+        }
+        self._dest_by_id = {
+            rec['dest_id']: rec for rec in self.destinations.to_dict(orient='records')
+        }
+        self._demand_by_id = {
+            dest_id: self._get_demand(rec) for dest_id, rec in self._dest_by_id.items()
+        }
+
+        # Per-destination feature arrays aligned with _dest_ids, so the
+        # candidate loop reads plain NumPy scalars by position
+        self._dest_idx = {dest_id: i for i, dest_id in enumerate(self._dest_ids)}
+        self._dest_demand = np.array(
+            [self._demand_by_id[dest_id] for dest_id in self._dest_ids], dtype=np.float64
+        )
+        if 'has_airstrip' in self.destinations.columns:
+            self._dest_has_airstrip = self.destinations['has_airstrip'].to_numpy(dtype=bool)
+        else:
+            self._dest_has_airstrip = np.zeros(len(self.destinations), dtype=bool)
+
+        # Position-indexed vehicle records plus aligned capacity/range
+        # arrays, so optimize_routes selects and orders the fleet with
+        # array ops instead of copying and sorting the DataFrame
+        self._vehicle_caps = self.vehicles['capacity_tons'].to_numpy(dtype=np.float64)
+        self._vehicle_range = self.vehicles['max_range_km'].to_numpy(dtype=np.float64)
+        self._vehicles_by_pos = [
+            _VehicleRec(
+                vehicle_id=rec['vehicle_id'],
+                type=rec['type'],
+                mode=rec.get('mode', 'GROUND'),
+                capacity_tons=rec['capacity_tons'],
+                max_range_km=rec['max_range_km'],
+                speed_kmh=rec.get('speed_kmh', 80.0)
+            )
+            for rec in self.vehicles.to_dict(orient='records')
+        ]
     
-    def _build_graph(self) -> Dict[str, Dict[str, Dict]]:
+    def _build_graph(self) -> None:
+        """Build the road network in CSR (compressed sparse row) form.
+
+        Edges are stored in parallel arrays — _indptr/_indices for the
+        adjacency structure plus _w_dist/_w_threat for the weights — so
+        graph sweeps walk contiguous memory instead of chasing nested
+        dict pointers. Column indices are sorted within each row, which
+        makes a single-edge lookup a searchsorted over the row slice.
+        """
+        from_pts = self.routes['from_point'].to_numpy()
+        to_pts = self.routes['to_point'].to_numpy()
+        dists = self.routes['distance_km'].to_numpy(dtype=np.float32)
+        ranks = np.array(
+            [THREAT_RANK.get(t, 0) for t in self.routes['threat_level']],
+            dtype=np.int8
+        )
+
+        self._nodes = sorted(set(from_pts) | set(to_pts))
+        self._node_index = {node: i for i, node in enumerate(self._nodes)}
+        n = len(self._nodes)
+
+        idx_from = np.array([self._node_index[p] for p in from_pts], dtype=np.int32)
+        idx_to = np.array([self._node_index[p] for p in to_pts], dtype=np.int32)
+
+        # Add both directions (bidirectional roads)
+        src = np.concatenate([idx_from, idx_to])
+        dst = np.concatenate([idx_to, idx_from])
+        w_dist = np.concatenate([dists, dists])
+        w_threat = np.concatenate([ranks, ranks])
+
+        order = np.lexsort((dst, src))
+        self._indptr = np.concatenate(
+            [[0], np.bincount(src, minlength=n).cumsum()]
+        ).astype(np.int32)
+        self._indices = dst[order]
+        self._w_dist = w_dist[order]
+        self._w_threat = w_threat[order]
+
+    def _edge_pos(self, i: int, j: int) -> int:
+        """Position of edge i -> j in the CSR arrays, or -1 if absent."""
+        start, end = self._indptr[i], self._indptr[i + 1]
+        pos = start + np.searchsorted(self._indices[start:end], j)
+        if pos < end and self._indices[pos] == j:
+            return int(pos)
+        return -1
+
+    def _build_distance_matrices(self) -> None:
+        """Precompute all-pairs shortest paths with Floyd-Warshall.
+
+        Builds two dense distance/predecessor matrix pairs: one over the
+        full graph and one with high-threat edges removed, so both values
+        of avoid_high_threat resolve to an O(1) lookup. The graph is tiny
+        (one node per supply point/destination on the road network), so
+        the |V|^2 matrices are cheap to hold.
         """
-        Build adjacency graph from routes.
-        graph[from][to] = {distance, threat_level, effective_distance, ...}
+        n = len(self._nodes)
+        rows = np.repeat(np.arange(n), np.diff(self._indptr))
+
+        # 0 means "no edge" for csgraph; all real distances are positive
+        weights_any = np.zeros((n, n))
+        weights_any[rows, self._indices] = self._w_dist
+        weights_safe = np.zeros((n, n))
+        safe = self._w_threat < THREAT_RANK['high']
+        weights_safe[rows[safe], self._indices[safe]] = self._w_dist[safe]
+
+        self._dist_any, self._pred_any = floyd_warshall(
+            weights_any, return_predecessors=True
+        )
+        self._dist_safe, self._pred_safe = floyd_warshall(
+            weights_safe, return_predecessors=True
+        )
+
+    def _graph_cache_path(self) -> str:
+        """Cache file path keyed on a content hash of the routes frame.
+
+        The CSR graph and APSP matrices derive from the routes data
+        alone, so a routes edit invalidates stale entries automatically.
         """
-        graph = {}
-        
-        for _, route in self.routes.iterrows():
-            from_id = route['from_point']
-            to_id = route['to_point']
-            
-            edge_data = {
-                'distance_km': route['distance_km'],
-                'threat_level': route['threat_level'],
-                'effective_distance': route['effective_distance'],
-                'road_condition': route['road_condition']
-            }
-            
-            # Add both directions (bidirectional roads)
-            if from_id not in graph:
-                graph[from_id] = {}
-            if to_id not in graph:
-                graph[to_id] = {}
-            
-            graph[from_id][to_id] = edge_data
-            graph[to_id][from_id] = edge_data
-        
-        return graph
-    
+        digest = hashlib.blake2b(
+            pd.util.hash_pandas_object(self.routes, index=False).values.tobytes(),
+            digest_size=16
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f'graph-{digest}.pkl')
+
+    def _load_graph_cache(self) -> bool:
+        """Restore precomputed graph state from disk; False on a miss."""
+        if self.cache_dir is None:
+            return False
+        path = self._graph_cache_path()
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"Could not read graph cache {path}: {e}")
+            return False
+
+        self._nodes = state['nodes']
+        self._node_index = {node: i for i, node in enumerate(self._nodes)}
+        self._indptr = state['indptr']
+        self._indices = state['indices']
+        self._w_dist = state['w_dist']
+        self._w_threat = state['w_threat']
+
+        matrices = state['matrices']
+        if matrices is not None:
+            (self._dist_any, self._pred_any,
+             self._dist_safe, self._pred_safe) = matrices
+        else:
+            # Cached by an install without scipy; rebuild if we have it
+            self._dist_any = None
+            if HAS_SCIPY:
+                self._build_distance_matrices()
+        return True
+
+    def _save_graph_cache(self) -> None:
+        """Persist the graph/APSP precompute; degrades to a no-op on error."""
+        if self.cache_dir is None:
+            return
+        matrices = None
+        if self._dist_any is not None:
+            matrices = (self._dist_any, self._pred_any,
+                        self._dist_safe, self._pred_safe)
+        state = {
+            'nodes': self._nodes,
+            'indptr': self._indptr,
+            'indices': self._indices,
+            'w_dist': self._w_dist,
+            'w_threat': self._w_threat,
+            'matrices': matrices
+        }
+        path = self._graph_cache_path()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path, 'wb') as f:
+                pickle.dump(state, f)
+        except OSError as e:
+            print(f"Could not write graph cache {path}: {e}")
+
+    def _reconstruct_path(self, pred: np.ndarray, i: int, j: int) -> List[str]:
+        """Rebuild the node path i -> j from a predecessor matrix."""
+        indices = [j]
+        while j != i:
+            j = pred[i, j]
+            if j < 0:
+                return []
+            indices.append(j)
+        indices.reverse()
+        return [self._nodes[k] for k in indices]
+
+    def _path_threat(self, path: List[str]) -> str:
+        """Highest threat level among the edges of a path."""
+        max_rank = THREAT_RANK['low']
+        for a, b in zip(path, path[1:]):
+            pos = self._edge_pos(self._node_index[a], self._node_index[b])
+            if pos >= 0:
+                max_rank = max(max_rank, int(self._w_threat[pos]))
+        return THREAT_NAME[max_rank]
+
+    def _distances_from(self, source: str, avoid_high_threat: bool) -> Dict[str, float]:
+        """Shortest graph distance from source to every reachable node.
+
+        One Dijkstra sweep, used to price all return legs to base per
+        optimization run instead of one path query per candidate
+        destination per greedy step.
+        """
+        src = self._node_index.get(source)
+        if src is None:
+            return {source: 0.0}
+
+        high_rank = THREAT_RANK['high']
+        indptr, indices = self._indptr, self._indices
+        w_dist, w_threat = self._w_dist, self._w_threat
+
+        n = len(self._nodes)
+        dist = np.full(n, np.inf)
+        dist[src] = 0.0
+        heap = [(0.0, src)]
+
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            for k in range(indptr[node], indptr[node + 1]):
+                if avoid_high_threat and w_threat[k] >= high_rank:
+                    continue
+                new_dist = d + w_dist[k]
+                neighbor = indices[k]
+                if new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    heapq.heappush(heap, (new_dist, neighbor))
+
+        nodes = self._nodes
+        return {nodes[i]: float(dist[i]) for i in np.flatnonzero(np.isfinite(dist))}
+
     def _get_edge(self, from_id: str, to_id: str) -> Optional[Dict]:
         """Get edge data between two nodes."""
-        if from_id in self.graph and to_id in self.graph[from_id]:
-            return self.graph[from_id][to_id]
-        return None
+        i = self._node_index.get(from_id)
+        j = self._node_index.get(to_id)
+        if i is None or j is None:
+            return None
+        pos = self._edge_pos(i, j)
+        if pos < 0:
+            return None
+        rank = int(self._w_threat[pos])
+        return {
+            'distance_km': float(self._w_dist[pos]),
+            'threat_level': THREAT_NAME[rank],
+            'threat_rank': rank
+        }
     
-    def _find_path_distance(self, from_id: str, to_id: str, avoid_high_threat: bool) -> Tuple[float, List[str], str]:
+    def _find_path_distance(self, from_id: str, to_id: str, avoid_high_threat: bool) -> Tuple[float, Tuple[str, ...], str]:
         """
-        Find distance between two points.
+        Find distance between two points, memoized per (from, to, avoid) key.
         First checks the route graph, then falls back to straight-line calculation.
-        Returns (distance, path, threat_level).
+        Returns (distance, path, threat_level); the path is an immutable tuple.
         """
+        key = (from_id, to_id, avoid_high_threat)
+        cached = self._path_cache.get(key)
+        if cached is None:
+            distance, path, threat = self._compute_path_distance(from_id, to_id, avoid_high_threat)
+            cached = (distance, tuple(path), threat)
+            self._path_cache[key] = cached
+        return cached
+
+    def _compute_path_distance(self, from_id: str, to_id: str, avoid_high_threat: bool) -> Tuple[float, List[str], str]:
+        """Uncached path query backing _find_path_distance."""
         if from_id == to_id:
             return 0.0, [from_id], 'low'
-        
-        # Try direct edge in graph first
-        edge = self._get_edge(from_id, to_id)
-        if edge:
-            if avoid_high_threat and edge['threat_level'] == 'high':
-                pass  # Skip direct high-threat, try to find alternate
-            else:
-                return edge['distance_km'], [from_id, to_id], edge['threat_level']
-        
-        # Try BFS for path through graph
-        from collections import deque
-        queue = deque([(from_id, [from_id], 0.0, 'low')])
-        visited = {from_id}
-        
-        while queue:
-            current, path, dist, max_threat = queue.popleft()
-            
-            if current not in self.graph:
-                continue
-            
-            for neighbor, edge_data in self.graph[current].items():
-                if neighbor in visited:
-                    continue
-                
+
+        # Precomputed all-pairs matrices: O(1) distance lookup plus a walk
+        # of the predecessor matrix to rebuild the path
+        if self._dist_any is not None:
+            i = self._node_index.get(from_id)
+            j = self._node_index.get(to_id)
+            if i is not None and j is not None:
+                if avoid_high_threat:
+                    dist, pred = self._dist_safe, self._pred_safe
+                else:
+                    dist, pred = self._dist_any, self._pred_any
+                if np.isfinite(dist[i, j]):
+                    path = self._reconstruct_path(pred, i, j)
+                    return float(dist[i, j]), path, self._path_threat(path)
+            return self._straight_line_fallback(from_id, to_id)
+
+        # Without scipy: Dijkstra through the CSR arrays. Edges are
+        # weighted by distance_km, so a plain BFS would return the
+        # first-discovered path rather than the shortest one.
+        src = self._node_index.get(from_id)
+        tgt = self._node_index.get(to_id)
+        if src is None or tgt is None:
+            return self._straight_line_fallback(from_id, to_id)
+
+        high_rank = THREAT_RANK['high']
+        indptr, indices = self._indptr, self._indices
+        w_dist, w_threat = self._w_dist, self._w_threat
+
+        n = len(self._nodes)
+        dist_to = np.full(n, np.inf)
+        rank_to = np.zeros(n, dtype=np.int8)
+        parents = np.full(n, -1, dtype=np.int32)
+        dist_to[src] = 0.0
+        rank_to[src] = THREAT_RANK['low']
+        heap = [(0.0, src)]
+
+        while heap:
+            d, current = heapq.heappop(heap)
+            if d > dist_to[current]:
+                continue  # Stale heap entry
+
+            if current == tgt:
+                indices_path = [current]
+                node = current
+                while node != src:
+                    node = int(parents[node])
+                    indices_path.append(node)
+                indices_path.reverse()
+                path = [self._nodes[k] for k in indices_path]
+                return float(d), path, THREAT_NAME[rank_to[current]]
+
+            for k in range(indptr[current], indptr[current + 1]):
                 # Skip high threat if avoiding
-                if avoid_high_threat and edge_data['threat_level'] == 'high':
+                if avoid_high_threat and w_threat[k] >= high_rank:
                     continue
-                
-                new_dist = dist + edge_data['distance_km']
-                new_path = path + [neighbor]
-                # Determine the higher threat level by comparing numeric values
-                edge_threat = edge_data['threat_level']
-                if self.threat_threshold.get(edge_threat, 0) > self.threat_threshold.get(max_threat, 0):
-                    new_threat = edge_threat
-                else:
-                    new_threat = max_threat
-                
-                if neighbor == to_id:
-                    return new_dist, new_path, new_threat
-                
-                visited.add(neighbor)
-                queue.append((neighbor, new_path, new_dist, new_threat))
-        
-        # No path in graph - calculate straight line distance using coordinates
+
+                new_dist = d + w_dist[k]
+                neighbor = indices[k]
+                if new_dist < dist_to[neighbor]:
+                    dist_to[neighbor] = new_dist
+                    # Carry the higher of the path's and the edge's threat rank
+                    rank_to[neighbor] = max(rank_to[current], w_threat[k])
+                    parents[neighbor] = current
+                    heapq.heappush(heap, (new_dist, neighbor))
+
+        return self._straight_line_fallback(from_id, to_id)
+
+    def _straight_line_fallback(self, from_id: str, to_id: str) -> Tuple[float, List[str], str]:
+        """Straight-line estimate for point pairs with no path in the graph."""
         from_coords = self._get_coords(from_id)
         to_coords = self._get_coords(to_id)
-        
+
         if from_coords and to_coords:
             distance = self._haversine_distance(from_coords, to_coords)
             return distance, [from_id, to_id], 'low'
-        
+
         # No path found
         return float('inf'), [], 'high'
     
     def _get_coords(self, point_id: str) -> Optional[Tuple[float, float]]:
         """Get coordinates for a supply point or destination."""
-        # Check supply points
-        sp_match = self.supply_points[self.supply_points['id'] == point_id]
-        if len(sp_match) > 0:
-            return (sp_match.iloc[0]['lat'], sp_match.iloc[0]['lon'])
-        
-        # Check destinations
-        dest_match = self.destinations[self.destinations['dest_id'] == point_id]
-        if len(dest_match) > 0:
-            return (dest_match.iloc[0]['lat'], dest_match.iloc[0]['lon'])
-        
+        rec = self._sp_by_id.get(point_id) or self._dest_by_id.get(point_id)
+        if rec is not None:
+            return (rec['lat'], rec['lon'])
         return None
     
     def _haversine_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
         """Calculate distance between two lat/lon points in km."""
-        import math
-        lat1, lon1 = coord1
-        lat2, lon2 = coord2
-        
-        R = 6371  # Earth's radius in km
-        
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-        
-        a = math.sin(delta_lat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        
-        return R * c
+        return _haversine_km(float(coord1[0]), float(coord1[1]),
+                             float(coord2[0]), float(coord2[1]))
     
-    def _get_demand(self, dest_row: pd.Series) -> float:
-        """Get total demand from destination row, handling both old and new column names."""
-        if 'total_demand_tons' in dest_row.index:
-            return dest_row['total_demand_tons']
-        elif 'demand_tons' in dest_row.index:
-            return dest_row['demand_tons']
+    def _get_demand(self, dest_rec: Dict) -> float:
+        """Get total demand from a destination record, handling both old and new column names."""
+        if 'total_demand_tons' in dest_rec:
+            return dest_rec['total_demand_tons']
+        elif 'demand_tons' in dest_rec:
+            return dest_rec['demand_tons']
         else:
             # Sum up categorized demand
             total = 0
             for cat in ['food_tons', 'ammo_tons', 'fuel_tons', 'medical_tons']:
-                if cat in dest_row.index:
-                    total += dest_row[cat]
+                if cat in dest_rec:
+                    total += dest_rec[cat]
             return total
     
     def optimize_routes(
@@ -206,56 +522,60 @@ class ConvoyOptimizer:
         """
         Optimize delivery routes from a single supply point.
         """
-        vehicles = self.vehicles[
-            self.vehicles['vehicle_id'].isin(available_vehicles)
-        ].copy()
-        
-        if len(vehicles) == 0:
+        mask = self.vehicles['vehicle_id'].isin(available_vehicles).to_numpy()
+        vehicle_idx = np.flatnonzero(mask)
+
+        if vehicle_idx.size == 0:
             print("No available vehicles provided")
             return []
-        
+
         # Sort vehicles by capacity (largest first for better packing)
-        vehicles = vehicles.sort_values('capacity_tons', ascending=False)
-        
+        vehicle_order = vehicle_idx[np.argsort(-self._vehicle_caps[vehicle_idx])]
+
         # Get supply point coordinates
         sp_coords = self._get_coords(supply_point_id)
         if not sp_coords:
             print(f"Could not find coordinates for {supply_point_id}")
             return []
-        
-        # Filter destinations to those within range of at least one vehicle
-        max_vehicle_range = vehicles['max_range_km'].max()
-        
-        reachable_destinations = []
-        for _, dest in self.destinations.iterrows():
-            dest_coords = (dest['lat'], dest['lon'])
-            distance = self._haversine_distance(sp_coords, dest_coords)
-            # Round trip must be within range
-            if distance * 2 <= max_vehicle_range:
-                reachable_destinations.append(dest['dest_id'])
-        
-        if not reachable_destinations:
+
+        # Filter destinations to those within range of at least one vehicle,
+        # with one vectorized haversine over all destination coordinates
+        max_vehicle_range = self._vehicle_range[vehicle_idx].max()
+
+        lat1_rad = np.radians(sp_coords[0])
+        lon1_rad = np.radians(sp_coords[1])
+        dlat = self._dest_lat_rad - lat1_rad
+        dlon = self._dest_lon_rad - lon1_rad
+        a = np.sin(dlat / 2)**2 + np.cos(lat1_rad) * np.cos(self._dest_lat_rad) * np.sin(dlon / 2)**2
+        distances = 2 * 6371 * np.arcsin(np.sqrt(a))
+
+        # Round trip must be within range
+        reachable_mask = distances * 2 <= max_vehicle_range
+
+        if not reachable_mask.any():
             print(f"No destinations within range of {supply_point_id}")
             return []
-        
-        # Get destinations sorted by priority
-        destinations = self.destinations[
-            self.destinations['dest_id'].isin(reachable_destinations)
-        ].copy()
-        destinations = destinations.sort_values('priority_score', ascending=False)
-        
+
+        # Priority ordering as one argsort over the cached score array;
+        # no DataFrame filter, sort or copy
+        priority_order = np.argsort(-self._dest_priority[reachable_mask])
+
         assignments = []
-        remaining_destinations = set(destinations['dest_id'].tolist())
+        remaining_destinations = set(self._dest_ids[reachable_mask][priority_order].tolist())
+
+        # Price all return legs to base with one Dijkstra sweep
+        return_dist = self._distances_from(supply_point_id, avoid_high_threat)
         
-        for _, vehicle in vehicles.iterrows():
+        for i in vehicle_order:
             if not remaining_destinations:
                 break
-            
+
             assignment = self._assign_vehicle_route(
-                vehicle=vehicle,
+                vehicle=self._vehicles_by_pos[i],
                 supply_point_id=supply_point_id,
                 destination_ids=remaining_destinations,
-                avoid_high_threat=avoid_high_threat
+                avoid_high_threat=avoid_high_threat,
+                return_dist=return_dist
             )
             
             if assignment and assignment.destinations:
@@ -267,106 +587,112 @@ class ConvoyOptimizer:
     
     def _assign_vehicle_route(
         self,
-        vehicle: pd.Series,
+        vehicle: _VehicleRec,
         supply_point_id: str,
         destination_ids: Set[str],
-        avoid_high_threat: bool
+        avoid_high_threat: bool,
+        return_dist: Dict[str, float]
     ) -> Optional[ConvoyAssignment]:
         """
         Assign optimal route to a single vehicle using greedy nearest-neighbor
         with proper path finding.
         """
-        capacity = vehicle['capacity_tons']
-        max_range = vehicle['max_range_km']
-        vehicle_mode = vehicle.get('mode', 'GROUND')
+        capacity = vehicle.capacity_tons
+        max_range = vehicle.max_range_km
+        vehicle_mode = vehicle.mode
 
         # For AIR vehicles, check if supply point has an airstrip
         if vehicle_mode == 'AIR':
-            sp_match = self.supply_points[self.supply_points['id'] == supply_point_id]
-            if len(sp_match) > 0 and not sp_match.iloc[0].get('has_airstrip', False):
+            sp_rec = self._sp_by_id.get(supply_point_id)
+            if sp_rec is not None and not sp_rec.get('has_airstrip', False):
                 return None  # Aircraft cannot depart from location without airstrip
 
         route_sequence = [supply_point_id]
         assigned_destinations = []
         total_distance = 0.0
         total_demand = 0.0
-        max_threat_seen = 'low'
+        max_rank_seen = THREAT_RANK['low']
 
         current_location = supply_point_id
         remaining = set(destination_ids)
         
         while remaining:
+            # One sweep from the current stop prices every candidate this
+            # step; the winner's path and threat are reconstructed once
+            # afterwards instead of once per candidate
+            dists_from_current = self._distances_from(current_location, avoid_high_threat)
+
             best_dest = None
             best_distance = float('inf')
-            best_path = []
-            best_threat = 'low'
-            
+
             for dest_id in remaining:
-                dest_matches = self.destinations[
-                    self.destinations['dest_id'] == dest_id
-                ]
-                if len(dest_matches) == 0:
+                dest_pos = self._dest_idx.get(dest_id)
+                if dest_pos is None:
                     continue
-                dest_row = dest_matches.iloc[0]
 
                 # For AIR vehicles, skip destinations without airstrips
-                if vehicle_mode == 'AIR' and not dest_row.get('has_airstrip', False):
+                if vehicle_mode == 'AIR' and not self._dest_has_airstrip[dest_pos]:
                     continue
 
-                demand = self._get_demand(dest_row)
+                demand = self._dest_demand[dest_pos]
 
                 # Check capacity
                 if total_demand + demand > capacity:
                     continue
-                
-                # Find path to this destination
-                dist_to_dest, path_to_dest, threat = self._find_path_distance(
-                    current_location, dest_id, avoid_high_threat
-                )
-                
-                if dist_to_dest == float('inf'):
+
+                # Distance from the one-sweep frontier; off-graph points
+                # fall back to the memoized straight-line estimate
+                dist_to_dest = dists_from_current.get(dest_id)
+                if dist_to_dest is None:
+                    dist_to_dest, _, _ = self._find_path_distance(
+                        current_location, dest_id, avoid_high_threat
+                    )
+
+                # A candidate no closer than the current best can never
+                # win; skip the return-leg and range checks for it
+                if dist_to_dest >= best_distance:
                     continue
-                
-                # Check if we can still return to base
-                dist_back, _, _ = self._find_path_distance(
-                    dest_id, supply_point_id, avoid_high_threat
-                )
-                
+
+                # Check if we can still return to base; off-graph points
+                # fall back to the memoized straight-line estimate
+                dist_back = return_dist.get(dest_id)
+                if dist_back is None:
+                    dist_back, _, _ = self._find_path_distance(
+                        dest_id, supply_point_id, avoid_high_threat
+                    )
+
                 if dist_back == float('inf'):
                     continue
-                
+
                 # Check range constraint
                 if total_distance + dist_to_dest + dist_back > max_range:
                     continue
-                
+
                 # Prefer closer destinations
-                if dist_to_dest < best_distance:
-                    best_distance = dist_to_dest
-                    best_dest = dest_id
-                    best_path = path_to_dest
-                    best_threat = threat
-            
+                best_distance = dist_to_dest
+                best_dest = dest_id
+
             if best_dest is None:
                 break
-            
+
+            # Rebuild path and threat for the winner only
+            best_distance, best_path, best_threat = self._find_path_distance(
+                current_location, best_dest, avoid_high_threat
+            )
+
             # Assign this destination (we know it exists since best_dest was found above)
-            dest_row = self.destinations[
-                self.destinations['dest_id'] == best_dest
-            ].iloc[0]
-            
             assigned_destinations.append(best_dest)
-            
+
             # Add intermediate path nodes (excluding current which is already in route)
             for node in best_path[1:]:
                 route_sequence.append(node)
-            
+
             total_distance += best_distance
-            total_demand += self._get_demand(dest_row)
+            total_demand += self._dest_demand[self._dest_idx[best_dest]]
             remaining.remove(best_dest)
             
             # Update max threat
-            if self.threat_threshold.get(best_threat, 0) > self.threat_threshold.get(max_threat_seen, 0):
-                max_threat_seen = best_threat
+            max_rank_seen = max(max_rank_seen, THREAT_RANK.get(best_threat, 0))
             
             current_location = best_dest
         
@@ -394,42 +720,47 @@ class ConvoyOptimizer:
                 dist_back = 0.0  # Can't estimate, assume negligible
         total_distance += dist_back
         
-        if self.threat_threshold.get(threat_back, 0) > self.threat_threshold.get(max_threat_seen, 0):
-            max_threat_seen = threat_back
+        max_rank_seen = max(max_rank_seen, THREAT_RANK.get(threat_back, 0))
         
         return ConvoyAssignment(
-            vehicle_id=vehicle['vehicle_id'],
-            vehicle_type=vehicle['type'],
-            vehicle_mode=vehicle.get('mode', 'GROUND'),
+            vehicle_id=vehicle.vehicle_id,
+            vehicle_type=vehicle.type,
+            vehicle_mode=vehicle.mode,
             supply_point=supply_point_id,
-            destinations=assigned_destinations,
+            destinations=tuple(assigned_destinations),
             total_distance_km=round(total_distance, 1),
             total_demand_tons=total_demand,
-            threat_exposure=max_threat_seen,
-            route_sequence=route_sequence,
-            speed_kmh=vehicle.get('speed_kmh', 80.0)
+            threat_exposure=THREAT_NAME[max_rank_seen],
+            route_sequence=tuple(route_sequence),
+            speed_kmh=vehicle.speed_kmh
         )
     
     def get_summary_stats(self, assignments: List[ConvoyAssignment]) -> Dict:
         """Generate summary statistics for route assignments."""
         if not assignments:
             return {}
-        
-        total_distance = sum(a.total_distance_km for a in assignments)
-        total_demand = sum(a.total_demand_tons for a in assignments)
-        total_destinations = sum(len(a.destinations) for a in assignments)
-        
+
+        count = len(assignments)
+        total_distance = np.fromiter(
+            (a.total_distance_km for a in assignments), dtype=np.float64, count=count
+        ).sum()
+        total_demand = np.fromiter(
+            (a.total_demand_tons for a in assignments), dtype=np.float64, count=count
+        ).sum()
+        total_destinations = np.fromiter(
+            (len(a.destinations) for a in assignments), dtype=np.int64, count=count
+        ).sum()
+
         threat_counts = {'low': 0, 'medium': 0, 'high': 0}
-        for a in assignments:
-            threat_counts[a.threat_exposure] = threat_counts.get(a.threat_exposure, 0) + 1
-        
+        threat_counts.update(Counter(a.threat_exposure for a in assignments))
+
         return {
-            'total_convoys': len(assignments),
-            'total_distance_km': round(total_distance, 1),
-            'total_demand_tons': total_demand,
-            'destinations_served': total_destinations,
+            'total_convoys': count,
+            'total_distance_km': round(float(total_distance), 1),
+            'total_demand_tons': float(total_demand),
+            'destinations_served': int(total_destinations),
             'threat_exposure_summary': threat_counts,
-            'avg_distance_per_convoy': round(total_distance / len(assignments), 1)
+            'avg_distance_per_convoy': round(float(total_distance) / count, 1)
         }
 
 